@@ -1,21 +1,77 @@
 import gkeepapi
 import json
+import os
+import re
 import traceback
-import smtplib, ssl
 import requests
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, timezone
 from googleapiclient.discovery import build
 from google.oauth2 import service_account
 
 
+# Contains both customizable settings and login info that shouldn't be
+# version controlled. Loaded once at import so that warm Lambda invocations
+# reuse it.
+with open('./config.json', 'r') as jsonFile:
+    config = json.load(jsonFile)
+
+# List of months to go from month number of appropriate String. Month numbers
+# use 1-based indexing, so a filler is added at index 0 to avoid off-by-one
+# errors
+months = ['FILLER', 'January', 'February', 'March', 'April', 'May', 'June',
+          'July', 'August', 'September', 'October', 'November', 'December']
+# Maps month Strings to their month number
+monthIndex = {name: i for i, name in enumerate(months)}
+
+# Matches the day number in a day header, e.g. '21' in 'Monday 21st'
+_DAY_RE = re.compile(r'\d+')
+
+# Fields of the document retrieved from the Docs service
+DOCUMENT_FIELDS = ('revisionId,body/content(paragraph(paragraphStyle/'
+                   'namedStyleType,elements/textRun/content),endIndex)')
+
+# Maximum number of requests to send to the Docs service in one batchUpdate
+CHUNK_SIZE = 500
+
+# Maximum size in bytes of the payload of an asynchronous Lambda invocation
+ASYNC_PAYLOAD_LIMIT = 256 * 1024
+
+SCOPES = ['https://www.googleapis.com/auth/documents']
+
+# HTTP session used for Todoist requests. Reused so that connections are kept
+# alive between requests and across warm Lambda invocations
+_session = requests.Session()
+
+# Google Docs service. Built lazily by getService and reused across warm
+# Lambda invocations
+_service = None
+
+# Keep account. Logged in to lazily by loginKeep and reused across warm Lambda
+# invocations
+keep = gkeepapi.Keep()
+_keepLoggedIn = False
+
+# Stores the Keep master token so that a new process in the same container can
+# resume the session instead of logging in again. Only helps when the runtime
+# process restarts within the same execution environment, since module globals
+# already keep the session across ordinary warm invocations
+TOKEN_FILE = '/tmp/keep_token'
+
+
 def lambda_handler(event, context):
     """Called by AWS Lambda when triggered. Calls main, and returns the traceback
-    if there is an exception.
+    if there is an exception. If the event contains chunks of requests sent by
+    invokeWrite, writes them to the document instead.
     """
     trace = 'Success!'
     try:
-        main()
+        if isinstance(event, dict) and 'chunks' in event:
+            loginKeep()
+            writeChunks(event['chunks'], event['revisionId'])
+        else:
+            main(context.invoked_function_arn)
     except Exception as e:
         trace = traceback.format_exc()
         print(trace)
@@ -31,6 +87,10 @@ def sendEmail(message):
     Args:
         message (String): message to be emailed
     """
+    # Only needed when reporting an error, so imported here rather than on
+    # every cold start
+    import smtplib, ssl
+
     # Port for SSL
     port = config['PORT']
 
@@ -42,23 +102,35 @@ def sendEmail(message):
         server.login(config['SEND_GMAIL'], config['EMAIL_PASSWORD'])
         server.sendmail(config['SEND_GMAIL'], config['RECEIVE_EMAIL'], message)
 
-def getLastHeader(doc, headerNum):
+def getLastHeaders(doc, headerNums):
     """Gets the text of the last header with the named style type of heading
-    headerNum. Used to extract the most previously added dates.
+    headerNum, for each headerNum in headerNums. Used to extract the most
+    previously added dates.
 
     Args:
         doc (Google Docs Document): Google Docs Document to extract text from
-        headerNum (int): Number of header
+        headerNums (list): Numbers of headers
 
     Returns:
-        String: A stripped version of the text which appears in the le
+        dict: Maps each headerNum to a stripped version of the text which
+        appears in the last header of that number
     """
+    wanted = {'HEADING_' + headerNum: headerNum for headerNum in headerNums}
+    headers = {}
     # Iterate through content in reverse. If a paragraph is found whose
-    # nameStyleType matches the desired header, return its content.
+    # nameStyleType matches a desired header not yet found, record its
+    # content. Stop once every desired header has been found.
     for content in reversed(doc['body']['content']):
-        if 'paragraph' in content and \
-        content['paragraph']['paragraphStyle']['namedStyleType'] == 'HEADING_' + headerNum:
-            return content['paragraph']['elements'][0]['textRun']['content'].strip()
+        paragraph = content.get('paragraph')
+        if paragraph is None:
+            continue
+        headerNum = wanted.get(paragraph['paragraphStyle']['namedStyleType'])
+        if headerNum is None or headerNum in headers:
+            continue
+        headers[headerNum] = paragraph['elements'][0]['textRun']['content'].strip()
+        if len(headers) == len(wanted):
+            break
+    return headers
 
 
 def getLastDate(doc):
@@ -72,13 +144,15 @@ def getLastDate(doc):
         lastMonth (int): last month added to document
         lastDay (int): last day added to document
     """
+    headers = getLastHeaders(doc, [config['YEAR_HEADER_NUM'],
+                                   config['MONTH_HEADER_NUM'],
+                                   config['DAY_HEADER_NUM']])
     # Last year is the text in the appropriate header as an int
-    lastYear = int(getLastHeader(doc, config['YEAR_HEADER_NUM']))
-    # Last month is the index that the text in the appropriate header occurs in
-    # in the months list
-    lastMonth = months.index(getLastHeader(doc, config['MONTH_HEADER_NUM']))
-    # Last day is the numbers present in the appropriate header
-    lastDay = int(''.join([char for char in getLastHeader(doc, config['DAY_HEADER_NUM']) if char.isdigit()]))
+    lastYear = int(headers[config['YEAR_HEADER_NUM']])
+    # Last month is the month number of the text in the appropriate header
+    lastMonth = monthIndex[headers[config['MONTH_HEADER_NUM']]]
+    # Last day is the number present in the appropriate header
+    lastDay = int(_DAY_RE.search(headers[config['DAY_HEADER_NUM']]).group())
     return lastYear, lastMonth, lastDay
 
 
@@ -94,53 +168,98 @@ def getEndIndex(doc):
     return doc['body']['content'][-1]['endIndex']
 
 
-def addText(text, endIndex, namedStyleType, requests):
-    """Adds requests to add text at endIndex with the desired nameStyleType.
-    Returns new endIndex.
+class TextBuilder:
+    """Accumulates paragraphs to be added to the end of the document, and
+    builds the requests to add them all at once.
 
-    Args:
-        text (String): text to add
-        endIndex (int): Current endIndex of document. Location to add text to
-        namedStyleType (String): desired namedStyleType of text
-        requests (list): list of requests to append requests to
-
-    Returns:
-        int: new endIndex after adding text
+    All text is inserted with a single insertText request, followed by one
+    updateParagraphStyle request per run of paragraphs sharing a
+    namedStyleType.
     """
-    # Finds new end index by incrementing endIndex by the length of the text
-    # plus 1 for the automatically appended '\n'
-    newEndIndex = endIndex + len(text) + 1
-    # Appends requests to add text, and then request to change namedStyleType
-    # as desired
-    requests.extend([
-        # Add text, including a '\n' at the previous line to create a new paragraph
-        # Note that a '\n' will automatically be appended to the end of the text
-        {
+
+    def __init__(self, endIndex):
+        """
+        Args:
+            endIndex (int): Current endIndex of document. Location to add
+            text to
+        """
+        self.startIndex = endIndex
+        self.endIndex = endIndex
+        # List of [startIndex, endIndex, namedStyleType] ranges to style
+        self.ranges = []
+        # List of paragraphs to insert, in order
+        self.texts = []
+
+    def addText(self, text, namedStyleType):
+        """Adds text as a new paragraph with the desired namedStyleType.
+        Returns new endIndex.
+
+        Args:
+            text (String): text to add
+            namedStyleType (String): desired namedStyleType of text
+
+        Returns:
+            int: new endIndex after adding text
+        """
+        # Finds new end index by incrementing endIndex by the length of the
+        # text plus 1 for the '\n' seperating it from the next paragraph
+        newEndIndex = self.endIndex + len(text) + 1
+        self.texts.append(text)
+        # Extend the previous range if it has the same style, rather than
+        # adding another request
+        if self.ranges and self.ranges[-1][2] == namedStyleType:
+            self.ranges[-1][1] = newEndIndex
+        else:
+            self.ranges.append([self.endIndex, newEndIndex, namedStyleType])
+        self.endIndex = newEndIndex
+        return newEndIndex
+
+    def numRequests(self):
+        """Gets the number of requests needed to add all accumulated text.
+
+        Returns:
+            int: number of requests getRequests will return
+        """
+        return len(self.ranges) + 1 if self.texts else 0
+
+    def getRequests(self):
+        """Gets the requests to add all accumulated text.
+
+        Returns:
+            list: list of requests to batch
+        """
+        if not self.texts:
+            return []
+        # Add text, including a '\n' at the previous line to create a new
+        # paragraph. Note that a '\n' will automatically be appended to the
+        # end of the text
+        requests = [{
             'insertText': {
                 'location': {
-                    'index': endIndex - 1
+                    'index': self.startIndex - 1
                 },
-                'text': '\n' + text
+                'text': '\n' + '\n'.join(self.texts)
             }
-        },
-        {
-            'updateParagraphStyle': {
-                'range': {
-                    'startIndex': endIndex,
-                    'endIndex': newEndIndex
-                },
-                'paragraphStyle': {
-                    'namedStyleType': namedStyleType
-                },
-                'fields': 'namedStyleType'
-            }
-        }
-    ])
-    return newEndIndex
-
-
-def ordinal(n):
-    """Gets the ordinal string of any int from 1 to 100.
+        }]
+        # Change the namedStyleType of each range as desired
+        for startIndex, endIndex, namedStyleType in self.ranges:
+            requests.append({
+                'updateParagraphStyle': {
+                    'range': {
+                        'startIndex': startIndex,
+                        'endIndex': endIndex
+                    },
+                    'paragraphStyle': {
+                        'namedStyleType': namedStyleType
+                    },
+                    'fields': 'namedStyleType'
+                }
+            })
+        return requests
+
+
+def computeOrdinal(n):
+    """Computes the ordinal string of any int from 1 to 100.
 
     Args:
         n (int): int to get ordinal of
@@ -156,6 +275,26 @@ def ordinal(n):
     return str(n) + suffix
 
 
+# Ordinal strings of each day of the month, indexed by day. Index 0 is unused
+_ORDINALS = tuple(computeOrdinal(n) for n in range(32))
+
+# Hour and suffix in the 12-hour clock format, indexed by 24-hour clock hour
+_HOURS_12 = tuple((hour % 12 or 12, 'am' if hour < 12 else 'pm')
+                  for hour in range(24))
+
+
+def ordinal(n):
+    """Gets the ordinal string of any day of the month.
+
+    Args:
+        n (int): int from 1 to 31 to get ordinal of
+
+    Returns:
+        String: ordinal string of n
+    """
+    return _ORDINALS[n]
+
+
 def getTime(datetime):
     """Returns the time of a datetime object as a String in the traditional
     12-hour clock format.
@@ -166,42 +305,195 @@ def getTime(datetime):
     Returns:
         String: time of datetime in 12-hour clock format
     """
+    hour, suffix = _HOURS_12[datetime.hour]
+    return f'{hour}:{datetime.minute:02}{suffix}'
 
-    # Determine hour and suffix for 12-hour clock format based upon the value
-    # of datetime.hour
-    if datetime.hour == 0:
-        hour = 12
-        suffix = 'am'
-    elif datetime.hour < 12:
-        hour = datetime.hour
-        suffix = 'am'
-    elif datetime.hour == 12:
-        hour = datetime.hour
-        suffix = 'pm'
-    else:
-        hour = datetime.hour % 12
-        suffix = 'pm'
 
-    return '{}:{:02}{}'.format(hour, datetime.minute, suffix)
+def getService():
+    """Gets the Google Docs service, building it on first use.
+
+    Returns:
+        Resource: Google Docs API service
+    """
+    global _service
+    if _service is None:
+        # Log in to Google Docs API using service account. It is necessary to
+        # login this way, as opposed to the standard process of validating
+        # using a pickled token, in order for login to work on AWS Lambda.
+        creds = service_account.Credentials.from_service_account_file(
+            config['CREDENTIALS_FILE'], scopes=SCOPES)
+        # Use the discovery document bundled with the client library rather
+        # than fetching it over the network
+        _service = build('docs', 'v1', credentials=creds,
+                         cache_discovery=False, static_discovery=True)
+    return _service
+
+
+def loginKeep():
+    """Logs in to Keep on first use, resuming from the master token in
+    TOKEN_FILE if present. Afterwards, syncs the existing session to pick up
+    any changes since the previous invocation.
+    """
+    global _keepLoggedIn
+    if _keepLoggedIn:
+        try:
+            try:
+                keep.sync()
+            except gkeepapi.exception.ResyncRequiredException:
+                # The server requested a full resync
+                keep.sync(resync=True)
+        except Exception:
+            # Log in again on the next invocation rather than retrying a sync
+            # of a session which may be broken
+            _keepLoggedIn = False
+            raise
+        return
+
+    # Resume using the stored master token if there is one, falling back to
+    # logging in if the token is rejected
+    if os.path.exists(TOKEN_FILE):
+        with open(TOKEN_FILE, 'r') as tokenFile:
+            masterToken = tokenFile.read()
+        try:
+            keep.resume(config['USERNAME'], masterToken)
+            _keepLoggedIn = True
+            return
+        except gkeepapi.exception.LoginException:
+            pass
+
+    keep.login(config['USERNAME'], config['PASSWORD'])
+    _keepLoggedIn = True
+    # The master token grants full access to the account, so only the owner
+    # may read it
+    fd = os.open(TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as tokenFile:
+        tokenFile.write(keep.getMasterToken())
+
+
+def getDocument():
+    """Retrieves the documents contents from the Docs service.
+
+    Returns:
+        Google Docs Document: the DOCUMENT_FIELDS of the document with id
+        config['DOCUMENT_ID']
+    """
+    # Only the header text, named style types, and endIndexes are used, so
+    # the rest of the document is left out of the response
+    return getService().documents().get(
+        documentId=config['DOCUMENT_ID'], fields=DOCUMENT_FIELDS).execute()
+
 
+def batchUpdate(requests, revisionId):
+    """Executes a batch request to complete each request in order. The batch
+    is rejected if the document has been changed since revisionId, since the
+    requests' indexes would no longer be correct.
 
-def notesToGoogleDoc(notes):
-    """Given a set of notes, add to the document in the desired format.
+    Args:
+        requests (list): list of requests to batch
+        revisionId (String): revision of the document the requests are based on
+
+    Returns:
+        String: revision of the document after the batch request
+    """
+    reply = getService().documents().batchUpdate(
+        documentId=config['DOCUMENT_ID'],
+        body={
+            'requests': requests,
+            'writeControl': {
+                'requiredRevisionId': revisionId
+            }
+        }).execute()
+    return reply['writeControl']['requiredRevisionId']
+
+
+def writeChunk(requests, notes, revisionId):
+    """Executes a batch request for a chunk of requests, then deletes the notes
+    the chunk was built from. Notes are only deleted once they have been
+    written, so that a later run resumes from the first unwritten note.
+
+    Args:
+        requests (list): list of requests to batch
+        notes (list): list of keep.note objects the requests were built from
+        revisionId (String): revision of the document the requests are based on
+
+    Returns:
+        String: revision of the document after the batch request
+    """
+    revisionId = batchUpdate(requests, revisionId)
+    deleteNotes(notes, keep)
+    return revisionId
+
+
+def writeChunks(chunks, revisionId):
+    """Executes a batch request for each chunk of requests in order, deleting
+    each chunk's notes from Keep once it has been written.
+
+    Args:
+        chunks (list): list of dicts with the 'requests' to batch and the
+        'noteIds' of the notes they were built from
+        revisionId (String): revision of the document the requests are based on
+    """
+    for chunk in chunks:
+        # Notes may already have been deleted, e.g. by a retried invocation
+        notes = [note for note in map(keep.get, chunk['noteIds']) if note]
+        revisionId = writeChunk(chunk['requests'], notes, revisionId)
+
+
+def invokeWrite(chunks, revisionId, functionArn):
+    """Asynchronously invokes this Lambda function to write chunks of requests
+    to the document and delete their notes, and returns without waiting for
+    the write to complete. If the chunks are too large to send, writes them
+    before returning instead.
+
+    Args:
+        chunks (list): list of dicts with the 'requests' to batch and the
+        'noteIds' of the notes they were built from
+        revisionId (String): revision of the document the requests are based on
+        functionArn (String): ARN, including any version or alias, of this
+        Lambda function
+    """
+    payload = json.dumps({
+        'chunks': chunks,
+        'revisionId': revisionId
+    })
+    if len(payload.encode()) > ASYNC_PAYLOAD_LIMIT:
+        writeChunks(chunks, revisionId)
+        return
+
+    # Only needed when writing asynchronously, so imported here rather than
+    # on every cold start
+    import boto3
+
+    boto3.client('lambda').invoke(
+        FunctionName=functionArn,
+        InvocationType='Event',
+        Payload=payload)
+
+
+def notesToGoogleDoc(notes, doc=None, functionArn=None):
+    """Given a set of notes, add to the document in the desired format, and
+    delete them from Keep. If config['SYNC_WRITE'] is false, the document is
+    written to and the notes deleted asynchronously by another invocation of
+    this Lambda function, if its ARN is given.
 
     Args:
         notes (list): list of keep.note objects
+        doc (Google Docs Document, optional): prefetched contents of the
+        document. Retrieved from the Docs service if not given
+        functionArn (String, optional): ARN, including any version or alias,
+        of this Lambda function. Used to invoke the same code asynchronously
     """
-    # Log in to Google Docs API using service account. It is necessary to login
-    # this way, as opposed to the standard process of validating using a pickled
-    # token, in order for login to work on AWS Lambda.
-    SCOPES = ['https://www.googleapis.com/auth/documents']
-    creds = service_account.Credentials.from_service_account_file(
-        config['CREDENTIALS_FILE'], scopes=SCOPES)
-    service = build('docs', 'v1', credentials=creds)
-
-    # Retrieve the documents contents from the Docs service.
-    DOCUMENT_ID = config['DOCUMENT_ID']
-    doc = service.documents().get(documentId=DOCUMENT_ID).execute()
+    if doc is None:
+        doc = getDocument()
+    # Revision of the document that requests are based on
+    revisionId = doc['revisionId']
+    # Whether to write to the document before returning. Otherwise, chunks
+    # of requests are collected and written by invokeWrite, which needs the
+    # ARN of this function
+    syncWrite = config.get('SYNC_WRITE', True) or functionArn is None
+    chunks = []
+    # Notes which the requests in builder were built from
+    chunkNotes = []
 
     # List used to match weekday numbers, with 0-based indexing, to the
     # appropriate String
@@ -209,58 +501,83 @@ def notesToGoogleDoc(notes):
                 'Saturday', 'Sunday']
     # Last year, month, and day present in document
     lastYear, lastMonth, lastDay = None, None, None
-    # endIndex of last entry in document
-    endIndex = None
-    # List of requests to batch
-    requests = []
+    # Accumulates text to add to the end of the document
+    builder = None
+    # Timezone to adjust times that notes were created to
+    tz = timezone(timedelta(hours=config['TZ_ADJUSTMENT']))
+    # namedStyleTypes of each kind of paragraph
+    yearStyle = f"HEADING_{config['YEAR_HEADER_NUM']}"
+    monthStyle = f"HEADING_{config['MONTH_HEADER_NUM']}"
+    dayStyle = f"HEADING_{config['DAY_HEADER_NUM']}"
+    titleStyle = f"HEADING_{config['TITLE_HEADER_NUM']}"
+    timeStyle = f"HEADING_{config['TIME_HEADER_NUM']}"
 
     for note in notes:
-        # If endIndex and other variables have not been assigned (iff this is
+        # If builder and other variables have not been assigned (iff this is
         # the first note of the iterator) then assign the variables
-        if not endIndex:
+        if not builder:
             lastYear, lastMonth, lastDay = getLastDate(doc)
-            endIndex = getEndIndex(doc)
+            builder = TextBuilder(getEndIndex(doc))
 
         # Time that note was created, adjusted by the appropriate timezone
-        timeCreated = note.timestamps.created.astimezone(
-            tz=timezone(timedelta(hours=config['TZ_ADJUSTMENT'])))
+        timeCreated = note.timestamps.created.astimezone(tz=tz)
         # If lastYear is not equal to the year that note was created, add the
-        # year to the document in the appropriate format. Update endIndex and
+        # year to the document in the appropriate format. Update
         # lastYear
         if timeCreated.year != lastYear:
-            endIndex = addText(str(timeCreated.year), endIndex,
-                               'HEADING_' + config['YEAR_HEADER_NUM'], requests)
+            builder.addText(str(timeCreated.year), yearStyle)
             lastYear = timeCreated.year
 
         # If lastMonth is not equal to the month that note was created, add the
-        # month to the document in the appropriate format. Update endIndex and
+        # month to the document in the appropriate format. Update
         # lastMonth
         if timeCreated.month != lastMonth:
-            endIndex = addText(months[timeCreated.month], endIndex,
-                               'HEADING_' + config['MONTH_HEADER_NUM'], requests)
+            builder.addText(months[timeCreated.month], monthStyle)
             lastMonth = timeCreated.month
 
         # If lastDay is not equal to the day that note was created, add the
-        # day to the document in the appropriate format. Update endIndex and
+        # day to the document in the appropriate format. Update
         # lastDay
         if timeCreated.day != lastDay:
             weekday = weekDays[timeCreated.weekday()]
-            endIndex = addText(weekday + ' ' + ordinal(timeCreated.day),
-                               endIndex, 'HEADING_' + config['DAY_HEADER_NUM'],
-                               requests)
+            builder.addText(f'{weekday} {ordinal(timeCreated.day)}', dayStyle)
             lastDay = timeCreated.day
 
         # Add the title of the note, the time it was created, and the text of the
         # note each in the appropriate format
-        endIndex = addText(note.title, endIndex,
-                           'HEADING_' + config['TITLE_HEADER_NUM'], requests)
-        endIndex = addText(getTime(timeCreated), endIndex,
-                           'HEADING_' + config['TIME_HEADER_NUM'], requests)
-        endIndex = addText(note.text, endIndex, 'NORMAL_TEXT', requests)
-
-    # Execute a batch request to complete each request in order
-    result = service.documents().batchUpdate(
-        documentId=DOCUMENT_ID, body={'requests': requests}).execute()
+        builder.addText(note.title, titleStyle)
+        builder.addText(getTime(timeCreated), timeStyle)
+        builder.addText(note.text, 'NORMAL_TEXT')
+        chunkNotes.append(note)
+
+        # Once enough requests have accumulated, execute them and continue
+        # from the new end of the document, which is known without retrieving
+        # the document again. Bounds the size of each batch request
+        if builder.numRequests() >= CHUNK_SIZE:
+            if syncWrite:
+                revisionId = writeChunk(builder.getRequests(), chunkNotes,
+                                        revisionId)
+            else:
+                chunks.append({
+                    'requests': builder.getRequests(),
+                    'noteIds': [note.id for note in chunkNotes]
+                })
+            chunkNotes = []
+            builder = TextBuilder(builder.endIndex)
+
+    # Execute a batch request to complete each remaining request in order
+    requests = builder.getRequests()
+    if syncWrite:
+        if requests:
+            writeChunk(requests, chunkNotes, revisionId)
+    else:
+        if requests:
+            chunks.append({
+                'requests': requests,
+                'noteIds': [note.id for note in chunkNotes]
+            })
+        if chunks:
+            invokeWrite(chunks, revisionId, functionArn)
 
 def deleteNotes(notes, keep):
     """Deletes notes from Keep.
@@ -282,7 +599,7 @@ def addTasks(tasks):
     """
     for task in tasks:
         # Adds task to Todoist using Todoist's REST API
-        requests.post(
+        _session.post(
             "https://api.todoist.com/rest/v1/tasks",
             data=json.dumps({
                 "content": task,
@@ -305,37 +622,34 @@ def clearTodoList(todoList, keep):
         task.delete()
     keep.sync()
 
-def main():
+def main(functionArn=None):
     """Gets notes from Keep, adds them to the document in the desired format,
     and deletes the notes from Keep.
+
+    Args:
+        functionArn (String, optional): ARN, including any version or alias,
+        of the running Lambda function. Needed to write to the document
+        asynchronously
     """
-    # Contains both customizable settings and login info that shouldn't be
-    # version controlled
-    filename = './config.json'
-    with open(filename, 'r') as jsonFile:
-        global config
-        config = json.load(jsonFile)
-
-    # List of months to go from month number of appropriate String. Month numbers
-    # use 1-based indexing, so a filler is added at index 0 to avoid off-by-one
-    # errors
-    global months
-    months = ['FILLER', 'January', 'February', 'March', 'April', 'May', 'June',
-              'July', 'August', 'September', 'October', 'November', 'December']
-
-    # Login to Keep
-    keep = gkeepapi.Keep()
-    success = keep.login(config['USERNAME'], config['PASSWORD'])
+    # Login to Keep while concurrently retrieving the document, as both are
+    # slow network calls
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        loginFuture = executor.submit(loginKeep)
+        docFuture = executor.submit(getDocument)
+        loginFuture.result()
+        doc = docFuture.result()
 
     # Gets all notes with the appropriate label and sort them based upon time
-    # created
-    journalNotes = sorted(keep.find(labels=[keep.findLabel(config['JOURNAL_LABEL'])]),
-                   key=lambda x: x.timestamps.created)
+    # created. Notes deleted by a previous warm invocation remain in the Keep
+    # session and are not filtered by find, so they are skipped here
+    journalNotes = sorted((note for note in
+                           keep.find(labels=[keep.findLabel(config['JOURNAL_LABEL'])])
+                           if not note.deleted),
+                          key=lambda x: x.timestamps.created)
 
     # If any such notes are found, add them to the document and delete them
     if journalNotes:
-        notesToGoogleDoc(journalNotes)
-        deleteNotes(journalNotes, keep)
+        notesToGoogleDoc(journalNotes, doc, functionArn)
 
     todoList = keep.get(config['TODOIST_NOTE_ID'])
     # If any entries in the todo list are found:
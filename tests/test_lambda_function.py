@@ -0,0 +1,233 @@
+import importlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+CONFIG = {
+    'CREDENTIALS_FILE': 'credentials.json',
+    'DOCUMENT_ID': 'document',
+    'USERNAME': 'user@example.com',
+    'PASSWORD': 'password',
+    'JOURNAL_LABEL': 'Journal',
+    'TODOIST_NOTE_ID': 'todo',
+    'TZ_ADJUSTMENT': 0,
+    'YEAR_HEADER_NUM': '1',
+    'MONTH_HEADER_NUM': '2',
+    'DAY_HEADER_NUM': '3',
+    'TITLE_HEADER_NUM': '4',
+    'TIME_HEADER_NUM': '5',
+}
+
+lambda_function = None
+
+
+def setUpModule():
+    """Imports lambda_function from a directory containing a test config.json,
+    since the config is loaded at import time.
+    """
+    global lambda_function
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, 'config.json'), 'w') as jsonFile:
+            json.dump(CONFIG, jsonFile)
+        sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+        os.chdir(tmp)
+        try:
+            lambda_function = importlib.import_module('lambda_function')
+        except ImportError as e:
+            raise unittest.SkipTest('dependencies not installed: %s' % e)
+        finally:
+            os.chdir(cwd)
+
+
+def header(headerNum, text):
+    return {
+        'endIndex': 1,
+        'paragraph': {
+            'paragraphStyle': {'namedStyleType': 'HEADING_' + headerNum},
+            'elements': [{'textRun': {'content': text + '\n'}}]
+        }
+    }
+
+
+class FakeNote:
+    """Mimics a gkeepapi note, whose delete only marks it as deleted."""
+
+    def __init__(self, noteId, created):
+        self.id = noteId
+        self.title = 'Title ' + noteId
+        self.text = 'Text ' + noteId
+        self.timestamps = SimpleNamespace(created=created, deleted=None)
+
+    @property
+    def deleted(self):
+        return self.timestamps.deleted is not None
+
+    def delete(self):
+        self.timestamps.deleted = datetime.now(timezone.utc)
+
+
+class FakeKeep:
+    """Mimics a gkeepapi Keep session, whose find does not filter out deleted
+    notes.
+    """
+
+    def __init__(self, notes):
+        self.notes = {note.id: note for note in notes}
+        self.todoList = SimpleNamespace(text='', items=[])
+
+    def find(self, labels=None):
+        return list(self.notes.values())
+
+    def findLabel(self, name):
+        return name
+
+    def get(self, noteId):
+        return self.todoList if noteId == CONFIG['TODOIST_NOTE_ID'] \
+            else self.notes[noteId]
+
+    def sync(self):
+        pass
+
+
+def styleRequest(startIndex, endIndex, namedStyleType):
+    return {
+        'updateParagraphStyle': {
+            'range': {'startIndex': startIndex, 'endIndex': endIndex},
+            'paragraphStyle': {'namedStyleType': namedStyleType},
+            'fields': 'namedStyleType'
+        }
+    }
+
+
+class TestTextBuilder(unittest.TestCase):
+
+    def testRequests(self):
+        builder = lambda_function.TextBuilder(10)
+        self.assertEqual(builder.getRequests(), [])
+        self.assertEqual(builder.numRequests(), 0)
+
+        # Each paragraph takes its length plus 1 for the seperating '\n'
+        self.assertEqual(builder.addText('2021', 'HEADING_1'), 15)
+        self.assertEqual(builder.addText('Title', 'HEADING_4'), 21)
+        self.assertEqual(builder.addText('12:00pm', 'HEADING_5'), 29)
+        self.assertEqual(builder.addText('one\ntwo', 'NORMAL_TEXT'), 37)
+        # Consecutive paragraphs with the same style share a range
+        self.assertEqual(builder.addText('three', 'NORMAL_TEXT'), 43)
+        self.assertEqual(builder.addText('Next', 'HEADING_4'), 48)
+
+        requests = builder.getRequests()
+        self.assertEqual(requests, [
+            {
+                'insertText': {
+                    'location': {'index': 9},
+                    'text': '\n2021\nTitle\n12:00pm\none\ntwo\nthree\nNext'
+                }
+            },
+            styleRequest(10, 15, 'HEADING_1'),
+            styleRequest(15, 21, 'HEADING_4'),
+            styleRequest(21, 29, 'HEADING_5'),
+            styleRequest(29, 43, 'NORMAL_TEXT'),
+            styleRequest(43, 48, 'HEADING_4'),
+        ])
+        self.assertEqual(builder.numRequests(), len(requests))
+        self.assertEqual(builder.endIndex, 48)
+        # The inserted text followed by the document's final '\n' ends at the
+        # builder's endIndex
+        self.assertEqual(9 + len(requests[0]['insertText']['text']) + 1, 48)
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        created = datetime(2020, 9, 25, 12, tzinfo=timezone.utc)
+        self.notes = [FakeNote('a', created), FakeNote('b', created)]
+        self.doc = {
+            'revisionId': 'revision',
+            'body': {'content': [header('1', '2020'),
+                                 header('2', 'September'),
+                                 header('3', 'Friday 25th')]}
+        }
+        patches = [
+            mock.patch.object(lambda_function, 'keep', FakeKeep(self.notes)),
+            mock.patch.object(lambda_function, 'loginKeep'),
+            mock.patch.object(lambda_function, 'getDocument',
+                              return_value=self.doc),
+            mock.patch.object(lambda_function, 'batchUpdate',
+                              return_value='revision'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def testWarmInvocationSkipsDeletedNotes(self):
+        lambda_function.main()
+        self.assertEqual(lambda_function.batchUpdate.call_count, 1)
+        self.assertTrue(all(note.deleted for note in self.notes))
+
+        # Second warm invocation reuses the same Keep session, which still
+        # contains the notes deleted by the first
+        lambda_function.main()
+        self.assertEqual(lambda_function.batchUpdate.call_count, 1)
+
+    def testFailedChunkKeepsItsNotes(self):
+        # Each note takes more than 3 requests, so each chunk holds one note
+        lambda_function.batchUpdate.side_effect = ['revision', Exception]
+        with mock.patch.object(lambda_function, 'CHUNK_SIZE', 3):
+            with self.assertRaises(Exception):
+                lambda_function.main()
+        self.assertTrue(self.notes[0].deleted)
+        self.assertFalse(self.notes[1].deleted)
+
+    def testAsyncWriteDeletesNotesAfterWriting(self):
+        boto3 = mock.MagicMock()
+        functionArn = 'arn:aws:lambda:us-east-1:123456789012:function:f:prod'
+        with mock.patch.dict(lambda_function.config, {'SYNC_WRITE': False}), \
+                mock.patch.dict(sys.modules, {'boto3': boto3}):
+            lambda_function.main(functionArn)
+        lambda_function.batchUpdate.assert_not_called()
+        self.assertFalse(any(note.deleted for note in self.notes))
+
+        # The asynchronous invocation runs the same version or alias, writes
+        # the notes, then deletes them
+        invoke = boto3.client.return_value.invoke
+        self.assertEqual(invoke.call_args.kwargs['FunctionName'], functionArn)
+        event = json.loads(invoke.call_args.kwargs['Payload'])
+        lambda_function.lambda_handler(event, None)
+        self.assertEqual(lambda_function.batchUpdate.call_count, 1)
+        self.assertTrue(all(note.deleted for note in self.notes))
+
+
+class TestLoginKeep(unittest.TestCase):
+
+    def setUp(self):
+        self.keep = mock.MagicMock()
+        patches = [
+            mock.patch.object(lambda_function, 'keep', self.keep),
+            mock.patch.object(lambda_function, '_keepLoggedIn', True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def testFullResyncWhenRequired(self):
+        self.keep.sync.side_effect = [
+            lambda_function.gkeepapi.exception.ResyncRequiredException, None]
+        lambda_function.loginKeep()
+        self.keep.sync.assert_called_with(resync=True)
+        self.assertTrue(lambda_function._keepLoggedIn)
+
+    def testLogsInAgainAfterFailedSync(self):
+        self.keep.sync.side_effect = Exception
+        with self.assertRaises(Exception):
+            lambda_function.loginKeep()
+        self.assertFalse(lambda_function._keepLoggedIn)
+
+
+if __name__ == '__main__':
+    unittest.main()